@@ -4,31 +4,46 @@ import subprocess
 import os
 import re
 from typing import Optional
+from filesystem_probe import FilesystemProbe, run_with_deadline
 
 class FileDetector:
-    def __init__(self):
+    def __init__(self, probe: Optional[FilesystemProbe] = None):
         self.supported_file_managers = ['thunar', 'nautilus', 'dolphin', 'pcmanfm', 'nemo']
+        self.probe = probe or FilesystemProbe()
     
     def get_selected_file(self) -> Optional[str]:
         """Try multiple methods to detect the currently selected file"""
         
         # Method 1: Try clipboard (works with Ctrl+C in most file managers)
+        # Clipboard and window title results are already checked, a second
+        # check would pay the stat deadline again on a slow mount
         file_path = self._get_from_clipboard()
-        if file_path and os.path.exists(file_path):
+        if file_path:
             return file_path
         
         # Method 2: Try DBus for specific file managers
         file_path = self._get_from_dbus()
-        if file_path and os.path.exists(file_path):
+        if file_path and self._path_exists(file_path, assume_on_timeout=True):
             return file_path
         
         # Method 3: Try to get from window title (fallback)
         file_path = self._get_from_window_title()
-        if file_path and os.path.exists(file_path):
+        if file_path:
             return file_path
         
         return None
     
+    def _path_exists(self, file_path: str, assume_on_timeout: bool = False) -> bool:
+        """Check that a path exists without letting a slow mount block the hotkey"""
+        fstype, policy = self.probe.get_filesystem_policy(file_path)
+        finished, exists = run_with_deadline(os.path.exists, policy.stat_deadline, file_path)
+
+        # Paths a file manager handed us (file:// URIs, DBus) are treated as
+        # present when the mount does not answer, so the parser can report
+        # partial results. Plain clipboard text and guessed paths must
+        # really exist.
+        return exists if finished else assume_on_timeout
+    
     def _get_from_clipboard(self) -> Optional[str]:
         """Get file path from clipboard"""
         try:
@@ -37,8 +52,10 @@ class FileDetector:
             if result.returncode == 0:
                 clipboard_content = result.stdout.strip()
                 if clipboard_content.startswith('file://'):
-                    return clipboard_content[7:]  # Remove file:// prefix
-                elif os.path.exists(clipboard_content):
+                    file_path = clipboard_content[7:]  # Remove file:// prefix
+                    if self._path_exists(file_path, assume_on_timeout=True):
+                        return file_path
+                elif self._path_exists(clipboard_content):
                     return clipboard_content
         except:
             pass
@@ -50,8 +67,10 @@ class FileDetector:
             if result.returncode == 0:
                 clipboard_content = result.stdout.strip()
                 if clipboard_content.startswith('file://'):
-                    return clipboard_content[7:]
-                elif os.path.exists(clipboard_content):
+                    file_path = clipboard_content[7:]
+                    if self._path_exists(file_path, assume_on_timeout=True):
+                        return file_path
+                elif self._path_exists(clipboard_content):
                     return clipboard_content
         except:
             pass
@@ -96,7 +115,7 @@ class FileDetector:
                         
                         # Try to extract path from common file manager title patterns
                         file_path = self._extract_path_from_title(title)
-                        if file_path and os.path.exists(file_path):
+                        if file_path and self._path_exists(file_path):
                             return file_path
         except:
             pass
@@ -139,7 +158,7 @@ class FileDetector:
                     
                     for directory in common_dirs:
                         full_path = os.path.join(directory, potential_path)
-                        if os.path.exists(full_path):
+                        if self._path_exists(full_path):
                             return full_path
         
         return None
@@ -2,6 +2,7 @@
 
 import sys
 import os
+import time
 import gi
 
 gi.require_version('Gtk', '4.0')
@@ -12,18 +13,22 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from metadata_parser import MetadataParser
 from file_detector import FileDetector
+from filesystem_probe import FilesystemProbe
 from popup_ui import FileStatsPopup
 
 class FileStatsApp:
     def __init__(self):
-        self.parser = MetadataParser()
-        self.detector = FileDetector()
+        # One probe so mountinfo is parsed once and each path resolved once
+        self.probe = FilesystemProbe()
+        self.parser = MetadataParser(self.probe)
+        self.detector = FileDetector(self.probe)
         self.app = None
         self.popup = None
         
     def run(self):
         """Main application entry point"""
         # Detect the selected file
+        started = time.monotonic()
         file_path = self.detector.get_selected_file()
         
         if not file_path:
@@ -31,11 +36,11 @@ class FileStatsApp:
             return
         
         # Get file metadata
-        file_info = self.parser.get_file_info(file_path)
+        file_info = self.parser.get_file_info(file_path, known_to_exist=True, started=started)
         
         # Create GTK application
         self.app = Gtk.Application(application_id='com.filestats.popup')
-        self.popup = FileStatsPopup(self.app)
+        self.popup = FileStatsPopup(self.app, self.parser)
         self.app.connect('activate', lambda app: self._on_activate(file_info))
         
         # Run the application
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+import ctypes
+import os
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+# Reported when a path could not even be resolved in time
+UNRESPONSIVE_FILESYSTEM = 'remote'
+
+# Network filesystems where every stat/read is a round trip to a server
+REMOTE_FILESYSTEMS = {
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', '9p', 'ceph', 'glusterfs',
+    'lustre', 'afs', 'davfs', 'fuse.sshfs', 'fuse.rclone', 'fuse.s3fs',
+    'fuse.gcsfuse', 'fuse.davfs2',
+    # Stat-ing an autofs trigger can block while the real mount is set up
+    'autofs',
+    UNRESPONSIVE_FILESYSTEM,
+}
+
+# statfs(2) f_type magic numbers, used when /proc/self/mountinfo is unavailable
+STATFS_MAGIC = {
+    0x6969: 'nfs',
+    0xFF534D42: 'cifs',
+    0xFE534D42: 'smb3',
+    0x517B: 'smbfs',
+    0x01021997: '9p',
+    0x00C36400: 'ceph',
+    0x65735546: 'fuse',
+}
+
+class IOPolicy:
+    """How much blocking I/O we are willing to do on a given filesystem"""
+
+    def __init__(self, name: str, deadline: Optional[float] = None, stat_deadline: Optional[float] = None,
+                 header_only: bool = False, header_bytes: int = 256 * 1024, readahead: bool = False):
+        self.name = name
+        self.deadline = deadline            # Seconds for the whole metadata read, None = unbounded
+        self.stat_deadline = stat_deadline  # Seconds for a single exists/getsize call
+        self.header_only = header_only      # Only probe the start of the file
+        self.header_bytes = header_bytes
+        self.readahead = readahead          # Ask the kernel to prefetch the header in one go
+
+LOCAL_POLICY = IOPolicy("local")
+FUSE_POLICY = IOPolicy("fuse", deadline=3.0, stat_deadline=1.0, header_only=True)
+REMOTE_POLICY = IOPolicy("remote", deadline=2.0, stat_deadline=0.5, header_only=True, readahead=True)
+
+def run_with_deadline(func: Callable, deadline: Optional[float], *args, **kwargs) -> Tuple[bool, Any]:
+    """Run a blocking call in a worker thread and wait at most `deadline` seconds.
+
+    Returns (finished, result). A call stuck in the kernel cannot be
+    interrupted from Python, so on timeout the daemon worker is abandoned
+    and will not keep the process alive. Exceptions raised by `func` are
+    re-raised in the caller.
+    """
+    if deadline is None:
+        return True, func(*args, **kwargs)
+
+    outcome = {}
+
+    def worker():
+        try:
+            outcome["result"] = func(*args, **kwargs)
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    thread.join(max(deadline, 0))
+
+    if thread.is_alive():
+        return False, None
+    if "error" in outcome:
+        raise outcome["error"]
+    return True, outcome.get("result")
+
+def advise_readahead(file_path: str, length: int):
+    """Hint the kernel to fetch the first `length` bytes with a single large read"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.posix_fadvise(fd, 0, length, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+class FilesystemProbe:
+    def __init__(self, mountinfo_path: str = '/proc/self/mountinfo'):
+        self.mountinfo_path = mountinfo_path
+        self._mounts = None
+        self._policies = {}
+
+    def get_filesystem_policy(self, file_path: str) -> Tuple[str, IOPolicy]:
+        """Return (fstype, policy) for a path, resolving each path only once"""
+        # The detector and the parser ask about the same path, and each
+        # lookup may pay a realpath deadline on a hung mount
+        key = os.path.abspath(file_path)
+        if key not in self._policies:
+            fstype = self.get_filesystem_type(file_path)
+            self._policies[key] = (fstype, self.get_policy(fstype))
+        return self._policies[key]
+
+    def get_filesystem_type(self, file_path: str) -> str:
+        """Detect the filesystem type backing a path"""
+        # Symlinks can point onto another mount, but resolving them stats
+        # every component, so a hung mount is assumed to be a remote one
+        finished, path = run_with_deadline(os.path.realpath, REMOTE_POLICY.stat_deadline, file_path)
+        if not finished:
+            return UNRESPONSIVE_FILESYSTEM
+
+        for mount_point, fstype in self._get_mounts():
+            if path == mount_point or path.startswith(mount_point.rstrip('/') + '/'):
+                return fstype
+
+        # statfs has to ask the filesystem, so it is bounded like any other call
+        try:
+            finished, fstype = run_with_deadline(self._statfs_type, REMOTE_POLICY.stat_deadline, path)
+        except (OSError, AttributeError):
+            return 'unknown'
+        return fstype if finished and fstype else 'unknown'
+
+    def get_policy(self, fstype: str) -> IOPolicy:
+        """Map a filesystem type to the I/O policy used when reading from it"""
+        if self.is_remote(fstype):
+            return REMOTE_POLICY
+        if fstype == 'fuse' or fstype.startswith('fuse.'):
+            return FUSE_POLICY
+        return LOCAL_POLICY
+
+    def is_remote(self, fstype: str) -> bool:
+        return fstype in REMOTE_FILESYSTEMS
+
+    def _get_mounts(self) -> List[Tuple[str, str]]:
+        """Parse mountinfo into (mount_point, fstype), longest mount point first.
+
+        mountinfo lists stacked mounts bottom first, so the lines are
+        reversed before the stable sort to make the topmost mount win.
+        """
+        if self._mounts is not None:
+            return self._mounts
+
+        mounts = []
+        try:
+            with open(self.mountinfo_path) as f:
+                for line in reversed(f.readlines()):
+                    # 36 35 98:0 /mnt1 /mnt2 rw,noatime master:1 - ext3 /dev/root rw
+                    pre, sep, post = line.partition(' - ')
+                    fields = pre.split()
+                    if not sep or len(fields) < 5 or not post.split():
+                        continue
+                    mounts.append((self._unescape(fields[4]), post.split()[0]))
+        except OSError:
+            pass
+
+        mounts.sort(key=lambda mount: len(mount[0]), reverse=True)
+        self._mounts = mounts
+        return mounts
+
+    def _unescape(self, field: str) -> str:
+        """Decode the octal escapes mountinfo uses for spaces, tabs and backslashes"""
+        for escaped, char in (('\\040', ' '), ('\\011', '\t'), ('\\012', '\n'), ('\\134', '\\')):
+            field = field.replace(escaped, char)
+        return field
+
+    def _statfs_type(self, path: str) -> Optional[str]:
+        """Read f_type from statfs(2), which os.statvfs does not expose"""
+        libc = ctypes.CDLL(None, use_errno=True)
+        # struct statfs starts with f_type on Linux; the buffer is larger than the struct
+        buf = ctypes.create_string_buffer(256)
+        if libc.statfs(os.fsencode(path), buf) != 0:
+            return None
+        f_type = ctypes.c_long.from_buffer(buf).value & 0xFFFFFFFF
+        return STATFS_MAGIC.get(f_type)
@@ -3,53 +3,145 @@
 import subprocess
 import json
 import os
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+import xml.etree.ElementTree as ET
+from typing import Dict, Any, Optional, List, Tuple
 from PIL import Image
-from PIL.ExifTags import TAGS
+from PIL.ExifTags import TAGS, GPSTAGS
 import mutagen
 from PyPDF2 import PdfReader
+from filesystem_probe import FilesystemProbe, IOPolicy, LOCAL_POLICY, run_with_deadline, advise_readahead
+
+# EXIF pointer tags to the Exif and GPS sub-IFDs
+EXIF_IFD_POINTER = 0x8769
+GPS_IFD_POINTER = 0x8825
+
+RDF_NAMESPACE = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}'
 
 class MetadataParser:
-    def __init__(self):
+    def __init__(self, probe: Optional[FilesystemProbe] = None):
+        self.probe = probe or FilesystemProbe()
         self.video_extensions = {'.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v'}
         self.audio_extensions = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a'}
         self.image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp', '.svg'}
         self.document_extensions = {'.pdf', '.doc', '.docx', '.txt', '.odt', '.rtf'}
 
-    def get_file_info(self, file_path: str) -> Dict[str, Any]:
-        if not os.path.exists(file_path):
-            return {"error": "File not found"}
+    def get_file_info(self, file_path: str, known_to_exist: bool = False,
+                      started: Optional[float] = None) -> Dict[str, Any]:
+        """Collect the summary shown in the popup.
+
+        `started` is the time.monotonic() at which the hotkey was pressed;
+        on slow mounts the policy deadline is one budget for the whole
+        press, including the time the detector already spent.
+        """
+        started = time.monotonic() if started is None else started
+        fstype, policy = self.probe.get_filesystem_policy(file_path)
+
+        def remaining(limit: Optional[float]) -> Optional[float]:
+            if policy.deadline is None:
+                return limit
+            left = max(policy.deadline - (time.monotonic() - started), 0)
+            return left if limit is None else min(limit, left)
+
+        # On slow mounts even a stat can hang, so every blocking call is bounded
+        finished = True
+        if not known_to_exist:
+            finished, exists = run_with_deadline(os.path.exists, remaining(policy.stat_deadline), file_path)
+            if finished and not exists:
+                return {"error": "File not found"}
         
         path_obj = Path(file_path)
         extension = path_obj.suffix.lower()
-        file_size = os.path.getsize(file_path)
+        file_size = None
+        if finished:
+            try:
+                finished, file_size = run_with_deadline(os.path.getsize, remaining(policy.stat_deadline), file_path)
+            except OSError:
+                return {"error": "File not found"}
         
         base_info = {
             "filename": path_obj.name,
             "extension": extension,
-            "size": self._format_size(file_size),
+            "size": self._format_size(file_size) if file_size is not None else "Unknown",
             "path": file_path
         }
 
+        if policy is not LOCAL_POLICY:
+            base_info["filesystem"] = fstype
+
+        if not finished:
+            return {**base_info, "type": self._get_type_name(extension),
+                    "partial": f"The {fstype} mount is not responding, showing partial results"}
+
         try:
-            if extension in self.video_extensions:
-                return {**base_info, **self._get_video_info(file_path)}
-            elif extension in self.audio_extensions:
-                return {**base_info, **self._get_audio_info(file_path)}
-            elif extension in self.image_extensions:
-                return {**base_info, **self._get_image_info(file_path)}
-            elif extension in self.document_extensions:
-                return {**base_info, **self._get_document_info(file_path)}
-            else:
-                return {**base_info, "type": "Unknown", "info": "Unsupported file type"}
+            finished, info = run_with_deadline(self._get_type_info, remaining(None), file_path, extension, policy)
+            if not finished:
+                return {**base_info, "type": self._get_type_name(extension),
+                        "partial": f"Timed out after {policy.deadline:g}s reading from the {fstype} mount"}
+            return {**base_info, **info}
         except Exception as e:
             return {**base_info, "error": f"Error parsing metadata: {str(e)}"}
 
-    def _get_video_info(self, file_path: str) -> Dict[str, Any]:
+    def _get_type_info(self, file_path: str, extension: str, policy: IOPolicy) -> Dict[str, Any]:
+        if policy.readahead:
+            advise_readahead(file_path, policy.header_bytes)
+
+        if extension in self.video_extensions:
+            return self._get_video_info(file_path, policy)
+        elif extension in self.audio_extensions:
+            return self._get_audio_info(file_path)
+        elif extension in self.image_extensions:
+            return self._get_image_info(file_path)
+        elif extension in self.document_extensions:
+            return self._get_document_info(file_path, policy)
+        else:
+            return {"type": "Unknown", "info": "Unsupported file type"}
+
+    def _get_type_name(self, extension: str) -> str:
+        if extension in self.video_extensions:
+            return "Video"
+        elif extension in self.audio_extensions:
+            return "Audio"
+        elif extension in self.image_extensions:
+            return "Image"
+        elif extension in self.document_extensions:
+            return "Document"
+        return "Unknown"
+
+    def get_all_metadata(self, file_path: str) -> List[Tuple[str, str, str]]:
+        """Decode the full tag set as (group, key, value) rows.
+
+        This is considerably more expensive than get_file_info, so it is
+        only called when the user asks to see everything.
+        """
+        extension = Path(file_path).suffix.lower()
+        fstype, policy = self.probe.get_filesystem_policy(file_path)
+
         try:
-            cmd = ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', file_path]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+            finished, rows = run_with_deadline(self._get_all_rows, policy.deadline, file_path, extension, policy)
+        except Exception as e:
+            return [("Error", "error", str(e))]
+
+        if not finished:
+            return [("Error", "timed out", f"Timed out after {policy.deadline:g}s reading from the {fstype} mount")]
+        return rows
+
+    def _get_all_rows(self, file_path: str, extension: str, policy: IOPolicy) -> List[Tuple[str, str, str]]:
+        if extension in self.video_extensions:
+            return self._get_ffprobe_rows(file_path, policy)
+        elif extension in self.audio_extensions:
+            return self._get_ffprobe_rows(file_path, policy) + self._get_audio_tag_rows(file_path)
+        elif extension in self.image_extensions:
+            return self._get_image_rows(file_path)
+        elif extension == '.pdf':
+            return self._get_pdf_rows(file_path)
+        return []
+
+    def _get_video_info(self, file_path: str, policy: IOPolicy = LOCAL_POLICY) -> Dict[str, Any]:
+        try:
+            result = subprocess.run(self._get_ffprobe_command(file_path, policy),
+                                    capture_output=True, text=True, timeout=policy.deadline or 10)
             
             if result.returncode != 0:
                 return {"type": "Video", "error": "Could not analyze video"}
@@ -136,7 +228,7 @@ class MetadataParser:
         except Exception as e:
             return {"type": "Image", "error": str(e)}
 
-    def _get_document_info(self, file_path: str) -> Dict[str, Any]:
+    def _get_document_info(self, file_path: str, policy: IOPolicy = LOCAL_POLICY) -> Dict[str, Any]:
         try:
             extension = Path(file_path).suffix.lower()
             info = {"type": "Document"}
@@ -144,10 +236,12 @@ class MetadataParser:
             if extension == '.pdf':
                 with open(file_path, 'rb') as f:
                     pdf = PdfReader(f)
-                    info.update({
-                        "pages": len(pdf.pages),
-                        "format": "PDF"
-                    })
+                    info["format"] = "PDF"
+
+                    # Counting pages walks the whole page tree, the info
+                    # dictionary only needs the trailer
+                    if not policy.header_only:
+                        info["pages"] = len(pdf.pages)
                     
                     if pdf.metadata:
                         if pdf.metadata.get('/Title'):
@@ -164,6 +258,150 @@ class MetadataParser:
         except Exception as e:
             return {"type": "Document", "error": str(e)}
 
+    def _get_ffprobe_command(self, file_path: str, policy: IOPolicy) -> List[str]:
+        cmd = ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams']
+        if policy.header_only:
+            # Only let ffprobe look at the start of the file instead of scanning it
+            cmd += ['-probesize', str(policy.header_bytes)]
+        cmd.append(file_path)
+        return cmd
+
+    def _get_ffprobe_rows(self, file_path: str, policy: IOPolicy = LOCAL_POLICY) -> List[Tuple[str, str, str]]:
+        # A missing or hung ffprobe should not hide the rows from other decoders,
+        # and its own timeout is what actually cancels it on a slow mount
+        try:
+            result = subprocess.run(self._get_ffprobe_command(file_path, policy),
+                                    capture_output=True, text=True, timeout=policy.deadline or 10)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            return [("Error", "ffprobe", str(e))]
+
+        if result.returncode != 0:
+            return []
+
+        try:
+            data = json.loads(result.stdout)
+        except ValueError as e:
+            return [("Error", "ffprobe", str(e))]
+
+        rows = []
+
+        if 'format' in data:
+            rows.extend(self._flatten_rows("Format", data['format']))
+
+        for stream in data.get('streams', []):
+            group = f"Stream #{stream.get('index', len(rows))} ({stream.get('codec_type', 'unknown')})"
+            rows.extend(self._flatten_rows(group, stream))
+
+        return rows
+
+    def _get_audio_tag_rows(self, file_path: str) -> List[Tuple[str, str, str]]:
+        audio_file = mutagen.File(file_path)
+        if not audio_file or not audio_file.tags:
+            return []
+
+        rows = []
+        for key, value in audio_file.tags.items():
+            if isinstance(value, list):
+                value = ", ".join(self._format_audio_tag_value(v) for v in value)
+            else:
+                value = self._format_audio_tag_value(value)
+            rows.append(("Tags", str(key), value))
+        return rows
+
+    def _format_audio_tag_value(self, value: Any) -> str:
+        # Binary ID3 frames (APIC, GEOB, PRIV) would otherwise render their
+        # whole payload, e.g. embedded cover art
+        data = getattr(value, 'data', None)
+        if isinstance(data, bytes):
+            return f"{type(value).__name__} <{len(data)} bytes>"
+        return self._format_tag_value(value)
+
+    def _get_image_rows(self, file_path: str) -> List[Tuple[str, str, str]]:
+        rows = []
+
+        with Image.open(file_path) as img:
+            exifdata = img.getexif()
+
+            for tag_id, value in exifdata.items():
+                if tag_id in (EXIF_IFD_POINTER, GPS_IFD_POINTER):
+                    continue
+                rows.append(("EXIF", str(TAGS.get(tag_id, tag_id)), self._format_tag_value(value)))
+
+            for tag_id, value in exifdata.get_ifd(EXIF_IFD_POINTER).items():
+                rows.append(("EXIF", str(TAGS.get(tag_id, tag_id)), self._format_tag_value(value)))
+
+            for tag_id, value in exifdata.get_ifd(GPS_IFD_POINTER).items():
+                rows.append(("GPS", str(GPSTAGS.get(tag_id, tag_id)), self._format_tag_value(value)))
+
+            xmp = img.info.get('xmp') or img.info.get('XML:com.adobe.xmp')
+            if xmp:
+                rows.extend(self._get_xmp_rows(xmp))
+
+        return rows
+
+    def _get_xmp_rows(self, xmp) -> List[Tuple[str, str, str]]:
+        if isinstance(xmp, bytes):
+            xmp = xmp.decode('utf-8', errors='replace')
+
+        try:
+            root = ET.fromstring(xmp.strip().strip('\x00'))
+        except ET.ParseError:
+            return []
+
+        # rdf:li items carry no name of their own, the property is the
+        # grandparent: <dc:subject><rdf:Bag><rdf:li>cat</rdf:li>...
+        parents = {child: parent for parent in root.iter() for child in parent}
+        values = {}
+
+        for element in root.iter():
+            if element.tag == RDF_NAMESPACE + 'Description':
+                # Simple properties are usually serialized as attributes
+                for key, value in element.attrib.items():
+                    if not key.endswith('}about'):
+                        values.setdefault(self._strip_namespace(key), []).append(value)
+            elif not element.text or not element.text.strip() or list(element):
+                continue
+            elif element.tag == RDF_NAMESPACE + 'li':
+                container = parents.get(element)
+                prop = parents.get(container) if container is not None else None
+                if prop is None:
+                    continue
+                key = self._strip_namespace(prop.tag)
+                # Alt holds translations of one value, the first is x-default
+                if container.tag == RDF_NAMESPACE + 'Alt' and key in values:
+                    continue
+                values.setdefault(key, []).append(element.text.strip())
+            else:
+                values.setdefault(self._strip_namespace(element.tag), []).append(element.text.strip())
+
+        return [("XMP", key, ", ".join(items)) for key, items in values.items()]
+
+    def _get_pdf_rows(self, file_path: str) -> List[Tuple[str, str, str]]:
+        with open(file_path, 'rb') as f:
+            pdf = PdfReader(f)
+            if not pdf.metadata:
+                return []
+            return [("PDF", str(key).lstrip('/'), str(value)) for key, value in pdf.metadata.items()]
+
+    def _flatten_rows(self, group: str, data: Dict[str, Any], prefix: str = "") -> List[Tuple[str, str, str]]:
+        rows = []
+        for key, value in data.items():
+            if isinstance(value, dict):
+                rows.extend(self._flatten_rows(group, value, f"{prefix}{key}."))
+            else:
+                rows.append((group, f"{prefix}{key}", str(value)))
+        return rows
+
+    def _strip_namespace(self, tag: str) -> str:
+        return tag.split('}', 1)[-1]
+
+    def _format_tag_value(self, value: Any) -> str:
+        if isinstance(value, bytes):
+            if len(value) > 64:
+                return f"<{len(value)} bytes>"
+            return value.decode('utf-8', errors='replace').strip('\x00')
+        return str(value)
+
     def _get_fps(self, stream: Dict) -> str:
         fps = stream.get('r_frame_rate', '0/1')
         try:
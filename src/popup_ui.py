@@ -1,14 +1,29 @@
 #!/usr/bin/env python3
 
+import threading
 import gi
 gi.require_version('Gtk', '4.0')
-from gi.repository import Gtk, GLib, Gdk
-from typing import Dict, Any
+from gi.repository import Gtk, GLib, Gdk, Gio, GObject, Pango
+from typing import Dict, Any, List, Tuple
+
+class MetadataEntry(GObject.Object):
+    """A single (group, key, value) row in the full metadata table"""
+    __gtype_name__ = 'FileStatsMetadataEntry'
+
+    group = GObject.Property(type=str, default="")
+    key = GObject.Property(type=str, default="")
+    value = GObject.Property(type=str, default="")
+
+    def __init__(self, group: str, key: str, value: str):
+        super().__init__(group=group, key=key, value=value)
 
 class FileStatsPopup:
-    def __init__(self, app):
+    def __init__(self, app, parser=None):
         self.window = None
         self.app = app
+        self.parser = parser
+        self.metadata_store = None
+        self.metadata_loaded = False
         
     def show_file_info(self, file_info: Dict[str, Any]):
         """Display file information in a popup window"""
@@ -104,9 +119,20 @@ class FileStatsPopup:
             ("Extension", file_info.get("extension", "Unknown")),
         ]
         
+        if "filesystem" in file_info:
+            basic_info.append(("Filesystem", file_info["filesystem"]))
+        
         for label, value in basic_info:
             self._add_info_row(container, label, value)
         
+        # Slow mounts may only give us part of the picture
+        if "partial" in file_info:
+            partial_label = Gtk.Label()
+            partial_label.set_markup(f"<i>{GLib.markup_escape_text(file_info['partial'])}</i>")
+            partial_label.set_halign(Gtk.Align.START)
+            partial_label.add_css_class("dim-label")
+            container.append(partial_label)
+        
         # Type-specific information
         file_type = file_info.get("type", "").lower()
         
@@ -122,6 +148,7 @@ class FileStatsPopup:
         # Add path at the end
         if "path" in file_info:
             self._add_info_row(container, "Path", file_info["path"], monospace=True)
+            self._add_all_metadata_section(container, file_info["path"])
     
     def _add_video_info(self, container: Gtk.Box, file_info: Dict[str, Any]):
         """Add video-specific information"""
@@ -226,6 +253,84 @@ class FileStatsPopup:
         row_box.append(value_widget)
         container.append(row_box)
     
+    def _add_all_metadata_section(self, container: Gtk.Box, file_path: str):
+        """Add an expander that lazily loads the full tag set into a ColumnView"""
+        if not self.parser:
+            return
+
+        self.metadata_store = Gio.ListStore(item_type=MetadataEntry)
+        self.metadata_loaded = False
+
+        column_view = Gtk.ColumnView(model=Gtk.NoSelection(model=self.metadata_store))
+        column_view.add_css_class("data-table")
+        column_view.append_column(self._create_metadata_column("Group", "group"))
+        column_view.append_column(self._create_metadata_column("Tag", "key"))
+        value_column = self._create_metadata_column("Value", "value")
+        value_column.set_expand(True)
+        column_view.append_column(value_column)
+
+        # The ColumnView needs its own scrolled window so that only the
+        # visible rows are realized as widgets
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+        scrolled.set_min_content_height(200)
+        scrolled.set_child(column_view)
+
+        expander = Gtk.Expander(label="All metadata")
+        expander.set_child(scrolled)
+        expander.connect("notify::expanded", self._on_metadata_expanded, file_path)
+        container.append(expander)
+
+    def _create_metadata_column(self, title: str, property_name: str) -> Gtk.ColumnViewColumn:
+        """Create a ColumnView column that binds a MetadataEntry property to a label"""
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_metadata_cell_setup)
+        factory.connect("bind", self._on_metadata_cell_bind, property_name)
+        return Gtk.ColumnViewColumn(title=title, factory=factory)
+
+    def _on_metadata_cell_setup(self, factory, list_item):
+        label = Gtk.Label()
+        label.set_halign(Gtk.Align.START)
+        label.set_selectable(True)
+        # Keep long values (XMP history, ffprobe extradata) from widening the
+        # fixed-size window, the full text is in the tooltip
+        label.set_ellipsize(Pango.EllipsizeMode.END)
+        label.set_max_width_chars(40)
+        list_item.set_child(label)
+
+    def _on_metadata_cell_bind(self, factory, list_item, property_name: str):
+        text = list_item.get_item().get_property(property_name)
+        label = list_item.get_child()
+        label.set_label(text)
+        label.set_tooltip_text(text or None)
+
+    def _on_metadata_expanded(self, expander, param, file_path: str):
+        """Decode the full tag set the first time the section is expanded"""
+        if not expander.get_expanded() or self.metadata_loaded:
+            return
+
+        self.metadata_loaded = True
+        self.metadata_store.append(MetadataEntry("", "Loading…", ""))
+
+        # ffprobe and large EXIF blocks can be slow, keep the UI responsive
+        thread = threading.Thread(target=self._load_all_metadata, args=(file_path,), daemon=True)
+        thread.start()
+
+    def _load_all_metadata(self, file_path: str):
+        rows = self.parser.get_all_metadata(file_path)
+        GLib.idle_add(self._populate_metadata_store, rows)
+
+    def _populate_metadata_store(self, rows: List[Tuple[str, str, str]]):
+        # Let a later expand retry after a timeout or decoder error
+        if any(group == "Error" for group, key, value in rows):
+            self.metadata_loaded = False
+
+        entries = [MetadataEntry(group, key, value) for group, key, value in rows]
+        if not entries:
+            entries = [MetadataEntry("", "No additional metadata", "")]
+        self.metadata_store.splice(0, self.metadata_store.get_n_items(), entries)
+        return False  # Don't repeat the idle callback
+
     def _center_window(self):
         """Center the window on the screen"""
         # Get display and monitor info
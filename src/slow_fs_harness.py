@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Simulate a slow network mount to exercise the remote filesystem policies.
+
+Wraps stat, lstat and open calls for a directory so every one of them
+sleeps, without needing FUSE, LD_PRELOAD or a real NFS/SMB server. The
+directory is reported as a mount of the given type through a fixture
+mountinfo, so the real probe, realpath deadline and policy lookup run:
+
+    python src/slow_fs_harness.py test.mp4 --latency 0.5 --fstype nfs4
+
+It exits non-zero if the detector and parser together overrun the
+policy budget, or if a latency above the stat deadline does not produce
+partial results.
+
+`--check-mounts` instead verifies mount classification against a fixture
+mountinfo, including an NFS home stacked on top of its autofs trigger.
+
+ffprobe runs as a separate process and is not throttled, only the
+Python side (stat, Pillow, mutagen, PyPDF2) is.
+"""
+
+import argparse
+import builtins
+import os
+import sys
+import tempfile
+import time
+from typing import Optional
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from filesystem_probe import FilesystemProbe, REMOTE_POLICY, LOCAL_POLICY
+
+# Allowance for thread start-up and scheduling on top of the policy budget
+BUDGET_SLACK = 0.25
+
+# Stacked mounts are listed bottom first, the nfs4 entry is the one in effect
+FIXTURE_MOUNTINFO = """\
+22 1 8:2 / / rw,relatime shared:1 - ext4 /dev/sda2 rw
+40 22 0:38 / /home rw,relatime shared:20 - autofs systemd-1 rw,fd=51
+95 40 0:52 / /home rw,relatime shared:41 - nfs4 server:/export/home rw,vers=4.2
+96 22 0:53 / /mnt/my\\040share rw,relatime shared:42 - cifs //server/share rw
+"""
+
+class SlowFile:
+    """File object wrapper that sleeps before every read and seek"""
+
+    def __init__(self, raw, latency: float):
+        self._raw = raw
+        self._latency = latency
+
+    def read(self, *args):
+        time.sleep(self._latency)
+        return self._raw.read(*args)
+
+    def readinto(self, buffer):
+        time.sleep(self._latency)
+        return self._raw.readinto(buffer)
+
+    def readline(self, *args):
+        time.sleep(self._latency)
+        return self._raw.readline(*args)
+
+    def seek(self, *args):
+        time.sleep(self._latency)
+        return self._raw.seek(*args)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._raw.close()
+        return False
+
+class SlowFilesystem:
+    """Context manager that makes everything under `root` behave like a slow mount"""
+
+    def __init__(self, root: str, latency: float = 0.5, fstype: str = 'nfs4'):
+        self.root = os.path.abspath(root)
+        self.latency = latency
+        self.fstype = fstype
+        self.mountinfo_path = None
+        self._originals = {}
+
+    def _is_slow(self, path) -> bool:
+        if isinstance(path, int):
+            return False
+        path = os.path.abspath(os.fsdecode(path))
+        return path == self.root or path.startswith(self.root.rstrip('/') + '/')
+
+    def _write_mountinfo(self) -> str:
+        """Describe `root` as a mount of `fstype` on top of the real mounts"""
+        with open('/proc/self/mountinfo') as f:
+            mountinfo = f.read()
+
+        mount_point = self.root.replace('\\', '\\134').replace(' ', '\\040').replace('\t', '\\011')
+        mountinfo += f"999 1 0:999 / {mount_point} rw,relatime - {self.fstype} server:/export rw\n"
+
+        with tempfile.NamedTemporaryFile('w', suffix='.mountinfo', delete=False) as f:
+            f.write(mountinfo)
+        return f.name
+
+    def __enter__(self):
+        original_open = builtins.open
+        original_stat = os.stat
+        original_lstat = os.lstat
+        self._originals = {'open': original_open, 'stat': original_stat, 'lstat': original_lstat}
+        self.mountinfo_path = self._write_mountinfo()
+
+        def slow_open(file, *args, **kwargs):
+            raw = original_open(file, *args, **kwargs)
+            return SlowFile(raw, self.latency) if self._is_slow(file) else raw
+
+        def slow_stat(path, *args, **kwargs):
+            if self._is_slow(path):
+                time.sleep(self.latency)
+            return original_stat(path, *args, **kwargs)
+
+        def slow_lstat(path, *args, **kwargs):
+            if self._is_slow(path):
+                time.sleep(self.latency)
+            return original_lstat(path, *args, **kwargs)
+
+        # os.path.exists/getsize look up os.stat and os.path.realpath looks
+        # up os.lstat at call time, so patching them covers all three
+        builtins.open = slow_open
+        os.stat = slow_stat
+        os.lstat = slow_lstat
+        return self
+
+    def __exit__(self, *exc_info):
+        builtins.open = self._originals['open']
+        os.stat = self._originals['stat']
+        os.lstat = self._originals['lstat']
+        os.unlink(self.mountinfo_path)
+        return False
+
+def run(file_path: str, latency: float, fstype: str, root: Optional[str] = None) -> bool:
+    """Run a hotkey press against a throttled file_path and check the budget"""
+    from metadata_parser import MetadataParser
+    from file_detector import FileDetector
+
+    root = root or os.path.dirname(os.path.abspath(file_path))
+
+    with SlowFilesystem(root, latency=latency, fstype=fstype) as slow_fs:
+        # Shared like in FileStatsApp
+        probe = FilesystemProbe(mountinfo_path=slow_fs.mountinfo_path)
+        detector = FileDetector(probe)
+        parser = MetadataParser(probe)
+
+        # Same path as a file:// URI from the clipboard
+        started = time.monotonic()
+        exists = detector._path_exists(file_path, assume_on_timeout=True)
+        print(f"exists check: {exists} in {time.monotonic() - started:.2f}s")
+
+        file_info = parser.get_file_info(file_path, known_to_exist=exists, started=started)
+        elapsed = time.monotonic() - started
+        detected_fstype, policy = probe.get_filesystem_policy(file_path)
+
+    print(f"hotkey to result: {elapsed:.2f}s on {detected_fstype} ({policy.name} policy)")
+    for key, value in file_info.items():
+        print(f"  {key}: {value}")
+
+    ok = exists
+    if not exists:
+        print("FAIL the file was not detected")
+
+    if policy.deadline is not None:
+        passed = elapsed <= policy.deadline + BUDGET_SLACK
+        ok = ok and passed
+        print(f"{'ok  ' if passed else 'FAIL'} finished within the {policy.deadline:g}s budget")
+
+    if policy.stat_deadline is not None and latency > policy.stat_deadline:
+        passed = "partial" in file_info
+        ok = ok and passed
+        print(f"{'ok  ' if passed else 'FAIL'} latency above the {policy.stat_deadline:g}s stat deadline gives partial results")
+
+    return ok
+
+def check_mounts() -> bool:
+    """Check filesystem classification against FIXTURE_MOUNTINFO"""
+    with tempfile.NamedTemporaryFile('w', suffix='.mountinfo', delete=False) as f:
+        f.write(FIXTURE_MOUNTINFO)
+
+    try:
+        probe = FilesystemProbe(mountinfo_path=f.name)
+        expected = [
+            ('/home/u/x.jpg', 'nfs4', REMOTE_POLICY),
+            ('/mnt/my share/doc.pdf', 'cifs', REMOTE_POLICY),
+            ('/usr/share/file.txt', 'ext4', LOCAL_POLICY),
+        ]
+
+        ok = True
+        for path, fstype, policy in expected:
+            actual = probe.get_filesystem_type(path)
+            passed = actual == fstype and probe.get_policy(actual) is policy
+            ok = ok and passed
+            print(f"{'ok  ' if passed else 'FAIL'} {path}: {actual} ({probe.get_policy(actual).name})")
+
+        passed = probe.get_policy('autofs') is REMOTE_POLICY
+        ok = ok and passed
+        print(f"{'ok  ' if passed else 'FAIL'} autofs is treated as slow")
+        return ok
+    finally:
+        os.unlink(f.name)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Run FileStats against a simulated slow mount")
+    arg_parser.add_argument("file", nargs="?", help="File to inspect")
+    arg_parser.add_argument("--check-mounts", action="store_true", help="Check mount classification against a fixture")
+    arg_parser.add_argument("--latency", type=float, default=0.5, help="Seconds added to every stat/read/seek")
+    arg_parser.add_argument("--fstype", default="nfs4", help="Filesystem type to report for the file")
+    arg_parser.add_argument("--root", help="Directory to throttle (defaults to the file's directory)")
+    args = arg_parser.parse_args()
+
+    if args.check_mounts:
+        sys.exit(0 if check_mounts() else 1)
+    if not args.file:
+        arg_parser.error("a file is required unless --check-mounts is given")
+
+    sys.exit(0 if run(args.file, args.latency, args.fstype, args.root) else 1)
+
+if __name__ == "__main__":
+    main()